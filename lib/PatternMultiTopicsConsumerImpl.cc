@@ -27,22 +27,20 @@ DECLARE_LOG_OBJECT()
 
 using namespace pulsar;
 
-PatternMultiTopicsConsumerImpl::PatternMultiTopicsConsumerImpl(ClientImplPtr client,
-                                                               const std::string pattern,
-                                                               const std::vector<std::string>& topics,
-                                                               const std::string& subscriptionName,
-                                                               const ConsumerConfiguration& conf,
-                                                               const LookupServicePtr lookupServicePtr_)
-    : MultiTopicsConsumerImpl(client, topics, subscriptionName, TopicName::get(pattern), conf,
+PatternMultiTopicsConsumerImpl::PatternMultiTopicsConsumerImpl(
+    ClientImplPtr client, const std::string patternString, const PULSAR_REGEX_NAMESPACE::regex& pattern,
+    const std::vector<std::string>& topics, const std::string& subscriptionName,
+    const ConsumerConfiguration& conf, const LookupServicePtr lookupServicePtr_)
+    : MultiTopicsConsumerImpl(client, topics, subscriptionName, TopicName::get(patternString), conf,
                               lookupServicePtr_),
-      patternString_(pattern),
-      pattern_(PULSAR_REGEX_NAMESPACE::regex(pattern)),
+      patternString_(patternString),
+      pattern_(pattern),
       autoDiscoveryTimer_(client->getIOExecutorProvider()->get()->createDeadlineTimer()),
       autoDiscoveryRunning_(false) {
-    namespaceName_ = TopicName::get(pattern)->getNamespaceName();
+    namespaceName_ = TopicName::get(patternString)->getNamespaceName();
 }
 
-const PULSAR_REGEX_NAMESPACE::regex PatternMultiTopicsConsumerImpl::getPattern() { return pattern_; }
+const PULSAR_REGEX_NAMESPACE::regex& PatternMultiTopicsConsumerImpl::getPattern() const { return pattern_; }
 
 void PatternMultiTopicsConsumerImpl::resetAutoDiscoveryTimer() {
     autoDiscoveryRunning_ = false;
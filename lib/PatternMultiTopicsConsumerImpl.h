@@ -47,12 +47,14 @@ class PatternMultiTopicsConsumerImpl : public MultiTopicsConsumerImpl {
     // which only contains after namespace part.
     // when subscribe, client will first get all topics that match given pattern.
     // `topics` contains the topics that match `patternString`.
+    // `pattern` is the compiled `patternString`, which is passed in so that it's only compiled once.
     PatternMultiTopicsConsumerImpl(ClientImplPtr client, const std::string patternString,
+                                   const PULSAR_REGEX_NAMESPACE::regex& pattern,
                                    const std::vector<std::string>& topics,
                                    const std::string& subscriptionName, const ConsumerConfiguration& conf,
                                    const LookupServicePtr lookupServicePtr_);
 
-    const PULSAR_REGEX_NAMESPACE::regex getPattern();
+    const PULSAR_REGEX_NAMESPACE::regex& getPattern() const;
 
     void autoDiscoveryTimerTask(const boost::system::error_code& err);
 
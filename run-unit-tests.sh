@@ -29,14 +29,26 @@ pushd tests
 
 export RETRY_FAILED="${RETRY_FAILED:-1}"
 
+# Colon separated gtest patterns of the tests that must not run concurrently with other tests, they are
+# excluded from the parallel run and run serially afterwards.
+# - CustomLoggerTest: the customized logger might affect other tests
+# Tests that change namespace policies (e.g. deduplication or backlog quotas) each use a dedicated namespace,
+# so they can stay in the parallel run.
+SERIAL_TESTS="CustomLoggerTest*"
+
 if [ -f /gtest-parallel ]; then
-    gtest_workers=10
-    # use nproc to set workers to 2 x the number of available cores if nproc is available
-    if [ -x "$(command -v nproc)" ]; then
-      gtest_workers=$(( $(nproc) * 2 ))
+    if [ -n "$GTEST_WORKERS" ]; then
+      # the number of workers can be tuned for the machine that runs the broker, e.g. GTEST_WORKERS=16
+      gtest_workers=$GTEST_WORKERS
+    else
+      gtest_workers=10
+      # use nproc to set workers to 2 x the number of available cores if nproc is available
+      if [ -x "$(command -v nproc)" ]; then
+        gtest_workers=$(( $(nproc) * 2 ))
+      fi
+      # set maximum workers to 10
+      gtest_workers=$(( gtest_workers > 10 ? 10 : gtest_workers ))
     fi
-    # set maximum workers to 10
-    gtest_workers=$(( gtest_workers > 10 ? 10 : gtest_workers ))
     echo "---- Run unit tests in parallel (workers=$gtest_workers) (retry_failed=${RETRY_FAILED})"
     tests=""
     if [ $# -eq 1 ]; then
@@ -45,9 +57,8 @@ if [ -f /gtest-parallel ]; then
     fi
     python3 /gtest-parallel $tests --dump_json_test_results=/tmp/gtest_parallel_results.json \
       --workers=$gtest_workers --retry_failed=$RETRY_FAILED -d /tmp \
-      ./pulsar-tests --gtest_filter='-CustomLoggerTest*'
-    # The customized logger might affect other tests
-    ./pulsar-tests --gtest_filter='CustomLoggerTest*'
+      ./pulsar-tests --gtest_filter="-$SERIAL_TESTS"
+    ./pulsar-tests --gtest_filter="$SERIAL_TESTS"
     RES=$?
 else
     ./pulsar-tests
@@ -37,15 +37,18 @@ int globalTestTlsMessagesCounter = 0;
 static const std::string serviceUrlTls = "pulsar+ssl://localhost:6651";
 static const std::string serviceUrlHttps = "https://localhost:8443";
 
-static const std::string caPath = "../test-conf/cacert.pem";
-static const std::string clientPublicKeyPath = "../test-conf/client-cert.pem";
-static const std::string clientPrivateKeyPath = "../test-conf/client-key.pem";
+static const std::string certsDir = "../test-conf/";
+static const std::string caPath = certsDir + "cacert.pem";
+static const std::string clientPublicKeyPath = certsDir + "client-cert.pem";
+static const std::string clientPrivateKeyPath = certsDir + "client-key.pem";
+static const std::string tlsAuthParams =
+    "tlsCertFile:" + clientPublicKeyPath + ",tlsKeyFile:" + clientPrivateKeyPath;
 
 // Man in middle certificate which tries to act as a broker by sending its own valid certificate
 static const std::string mimServiceUrlTls = "pulsar+ssl://localhost:6653";
 static const std::string mimServiceUrlHttps = "https://localhost:8444";
 
-static const std::string mimCaPath = "../test-conf/hn-verification/cacert.pem";
+static const std::string mimCaPath = certsDir + "hn-verification/cacert.pem";
 
 static void sendCallBackTls(Result r, const MessageId& msgId) {
     ASSERT_EQ(r, ResultOk);
@@ -364,10 +367,13 @@ TEST(AuthPluginTest, testDisable) {
     ASSERT_EQ(auth.use_count(), 1);
 }
 
-TEST(AuthPluginTest, testAuthFactoryTls) {
+// The TLS plugin can be created either by its short name or by the class name of the Java client
+class AuthFactoryTlsTest : public ::testing::TestWithParam<std::string> {};
+
+TEST_P(AuthFactoryTlsTest, testAuthFactoryTls) {
     pulsar::AuthenticationDataPtr data;
-    AuthenticationPtr auth = pulsar::AuthFactory::create(
-        "tls", "tlsCertFile:" + clientPublicKeyPath + ",tlsKeyFile:" + clientPrivateKeyPath);
+    AuthenticationPtr auth = pulsar::AuthFactory::create(GetParam(), tlsAuthParams);
+    ASSERT_TRUE(auth != NULL);
     ASSERT_EQ(auth->getAuthMethodName(), "tls");
     ASSERT_EQ(auth->getAuthData(data), pulsar::ResultOk);
     ASSERT_EQ(data->hasDataForTls(), true);
@@ -389,6 +395,9 @@ TEST(AuthPluginTest, testAuthFactoryTls) {
     ASSERT_EQ(ResultOk, result);
 }
 
+INSTANTIATE_TEST_CASE_P(AuthPluginTest, AuthFactoryTlsTest,
+                        ::testing::Values("tls", "org.apache.pulsar.client.impl.auth.AuthenticationTls"));
+
 TEST(AuthPluginTest, testAuthFactoryAthenz) {
     Latch latch(1);
     std::thread zts(std::bind(&testAthenz::mockZTS, std::ref(latch), 9998));
@@ -23,11 +23,19 @@
 
 #include <boost/algorithm/string.hpp>
 #include <boost/asio.hpp>
+#include <cstdio>
+#include <ctime>
 #include <fstream>
+#include <memory>
+#include <mutex>
 #include <streambuf>
 #include <string>
+#include <tuple>
+#include <vector>
 
+#include "SendUtils.h"
 #include "lib/Future.h"
+#include "lib/Latch.h"
 #include "lib/LogUtils.h"
 #include "lib/Utils.h"
 DECLARE_LOG_OBJECT()
@@ -39,46 +47,51 @@ static const std::string serviceUrlHttp = "http://localhost:8080";
 
 static const std::string tokenPath = "../.test-token.txt";
 
+// The token file doesn't change while the tests run, so it's only read once, including when the token is
+// provided by a supplier that calls this function for each connection
 static std::string getToken() {
-    std::ifstream file(tokenPath);
-    std::string str((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
-    return str;
+    static const std::string token = [] {
+        std::ifstream file(tokenPath);
+        return std::string((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
+    }();
+    return token;
 }
 
-TEST(AuthPluginToken, testToken) {
-    ClientConfiguration config = ClientConfiguration();
-    std::string token = getToken();
-    AuthenticationPtr auth = pulsar::AuthToken::createWithToken(token);
-
-    ASSERT_TRUE(auth != NULL);
-    ASSERT_EQ(auth->getAuthMethodName(), "token");
-
-    pulsar::AuthenticationDataPtr data;
-    ASSERT_EQ(auth->getAuthData(data), pulsar::ResultOk);
-    ASSERT_EQ(data->hasDataFromCommand(), true);
-    ASSERT_EQ(data->getCommandData(), token);
-    ASSERT_EQ(data->hasDataForTls(), false);
-    ASSERT_EQ(data->hasDataForHttp(), true);
-    ASSERT_EQ(auth.use_count(), 1);
-
-    config.setAuth(auth);
-    Client client(serviceUrl, config);
-
-    std::string topicName = "persistent://private/auth/test-token";
+// Produces a batch of messages on `topicName` and expects the message listener to receive exactly those
+// messages in order, then checks that no more message is delivered
+static void produceAndConsume(Client& client, const std::string& topicName) {
     std::string subName = "subscription-name";
     int numOfMessages = 10;
 
-    Producer producer;
-    Result result = client.createProducer(topicName, producer);
-    ASSERT_EQ(ResultOk, result);
+    // Create the producer while subscribing, the two lookups and handshakes with the broker are independent
+    Promise<Result, Producer> producerPromise;
+    client.createProducerAsync(topicName, batchingProducerConf(numOfMessages),
+                               WaitForCallbackValue<Producer>(producerPromise));
+
+    // The listener shares its state by value, so it stays valid if an assertion returns early
+    Latch latch(numOfMessages);
+    auto mutex = std::make_shared<std::mutex>();
+    auto receivedMessages = std::make_shared<std::vector<Message>>();
+    receivedMessages->reserve(numOfMessages);
+    ConsumerConfiguration consumerConf;
+    consumerConf.setConsumerType(ConsumerExclusive);
+    consumerConf.setMessageListener(
+        [latch, mutex, receivedMessages](Consumer consumer, const Message& msg) mutable {
+            consumer.acknowledge(msg);
+            {
+                std::lock_guard<std::mutex> lock(*mutex);
+                receivedMessages->emplace_back(msg);
+            }
+            latch.countdown();
+        });
 
     Consumer consumer;
-    result = client.subscribe(topicName, subName, consumer);
+    Result result = client.subscribe(topicName, subName, consumerConf, consumer);
     ASSERT_EQ(ResultOk, result);
 
-    // handling dangling subscriptions
-    consumer.unsubscribe();
-    client.subscribe(topicName, subName, consumer);
+    Producer producer;
+    result = producerPromise.getFuture().get(producer);
+    ASSERT_EQ(ResultOk, result);
 
     std::string temp = producer.getTopic();
     ASSERT_EQ(temp, topicName);
@@ -86,7 +99,7 @@ TEST(AuthPluginToken, testToken) {
     ASSERT_EQ(temp, topicName);
     ASSERT_EQ(consumer.getSubscriptionName(), subName);
 
-    // Send Asynchronously
+    // Send Asynchronously, all the messages are grouped into one batch
     std::string prefix = "test-token-message-";
     for (int i = 0; i < numOfMessages; i++) {
         std::string messageContent = prefix + std::to_string(i);
@@ -96,76 +109,94 @@ TEST(AuthPluginToken, testToken) {
         LOG_INFO("sending message " << messageContent);
     }
 
-    producer.flush();
+    ASSERT_EQ(ResultOk, producer.flush());
+
+    ASSERT_TRUE(latch.wait(std::chrono::seconds(10)));
+    // Closing the consumer also sends the pending acknowledgments
+    ASSERT_EQ(ResultOk, consumer.close());
+
+    {
+        std::lock_guard<std::mutex> lock(*mutex);
+        ASSERT_EQ(numOfMessages, receivedMessages->size());
+        for (int i = 0; i < numOfMessages; i++) {
+            const Message& receivedMsg = (*receivedMessages)[i];
+            std::string expectedMessageContent = prefix + std::to_string(i);
+            LOG_INFO("Received Message with [ content - " << receivedMsg.getDataAsString()
+                                                          << "] [ messageID = " << receivedMsg.getMessageId()
+                                                          << "]");
+            ASSERT_EQ(receivedMsg.getProperty("msgIndex"), std::to_string(i));
+            ASSERT_EQ(expectedMessageContent, receivedMsg.getDataAsString());
+        }
+    }
 
+    // All the messages were acknowledged, so no more message is delivered to the subscription
+    Consumer noListenerConsumer;
+    ASSERT_EQ(ResultOk, client.subscribe(topicName, subName, noListenerConsumer));
     Message receivedMsg;
-    for (int i = 0; i < numOfMessages; i++) {
-        Result res = consumer.receive(receivedMsg);
-        ASSERT_EQ(ResultOk, res);
-
-        std::string expectedMessageContent = prefix + std::to_string(i);
-        LOG_INFO("Received Message with [ content - "
-                 << receivedMsg.getDataAsString() << "] [ messageID = " << receivedMsg.getMessageId() << "]");
-        ASSERT_EQ(receivedMsg.getProperty("msgIndex"), std::to_string(i));
-        ASSERT_EQ(expectedMessageContent, receivedMsg.getDataAsString());
-        ASSERT_EQ(ResultOk, consumer.acknowledge(receivedMsg));
-    }
+    ASSERT_EQ(ResultTimeout, noListenerConsumer.receive(receivedMsg, 100));
 }
 
-TEST(AuthPluginToken, testTokenWithHttpUrl) {
-    ClientConfiguration config = ClientConfiguration();
-    std::string token = getToken();
-    config.setAuth(pulsar::AuthToken::createWithToken(token));
-    Client client(serviceUrlHttp, config);
+TEST(AuthTokenTest, testTokenFromFile) {
+    const std::string tokenFilePath = "/tmp/test-token-file-" + std::to_string(time(nullptr)) + ".txt";
+    std::ofstream(tokenFilePath) << "token-AAAA";
 
-    std::string topicName = "persistent://private/auth/test-token-http";
-    std::string subName = "subscription-name";
-    int numOfMessages = 10;
+    AuthenticationPtr auth = AuthToken::create("file://" + tokenFilePath);
+    AuthenticationDataPtr data;
+    ASSERT_EQ(ResultOk, auth->getAuthData(data));
+    ASSERT_EQ("token-AAAA", data->getCommandData());
+    ASSERT_EQ("Authorization: Bearer token-AAAA", data->getHttpHeaders());
 
-    Producer producer;
-    Result result = client.createProducer(topicName, producer);
-    ASSERT_EQ(ResultOk, result);
+    // The file is read for each request, so a rotated token of the same length is used immediately
+    std::ofstream(tokenFilePath) << "token-BBBB";
+    ASSERT_EQ("token-BBBB", data->getCommandData());
 
-    Consumer consumer;
-    result = client.subscribe(topicName, subName, consumer);
-    ASSERT_EQ(ResultOk, result);
+    std::remove(tokenFilePath.c_str());
+}
 
-    // handling dangling subscriptions
-    consumer.unsubscribe();
-    client.subscribe(topicName, subName, consumer);
+static AuthenticationPtr createTokenAuth(const std::string& tokenSource) {
+    if (tokenSource == "supplier") {
+        return AuthToken::create([] { return getToken(); });
+    } else if (tokenSource == "file") {
+        return AuthToken::create("file://" + tokenPath);
+    } else {
+        return AuthToken::createWithToken(getToken());
+    }
+}
 
-    std::string temp = producer.getTopic();
-    ASSERT_EQ(temp, topicName);
-    temp = consumer.getTopic();
-    ASSERT_EQ(temp, topicName);
-    ASSERT_EQ(consumer.getSubscriptionName(), subName);
+// The token is either passed directly, provided by a supplier or read from a file, and the client looks up
+// topics with either the binary protocol or HTTP
+class AuthTokenProduceConsumeTest : public ::testing::TestWithParam<std::tuple<std::string, std::string>> {};
 
-    // Send Asynchronously
-    std::string prefix = "test-token-message-";
-    for (int i = 0; i < numOfMessages; i++) {
-        std::string messageContent = prefix + std::to_string(i);
-        Message msg =
-            MessageBuilder().setContent(messageContent).setProperty("msgIndex", std::to_string(i)).build();
-        producer.sendAsync(msg, NULL);
-        LOG_INFO("sending message " << messageContent);
-    }
+TEST_P(AuthTokenProduceConsumeTest, testToken) {
+    const std::string& url = std::get<0>(GetParam());
+    const std::string& tokenSource = std::get<1>(GetParam());
 
-    producer.flush();
+    ClientConfiguration config = ClientConfiguration();
+    AuthenticationPtr auth = createTokenAuth(tokenSource);
 
-    Message receivedMsg;
-    for (int i = 0; i < numOfMessages; i++) {
-        Result res = consumer.receive(receivedMsg);
-        ASSERT_EQ(ResultOk, res);
-
-        std::string expectedMessageContent = prefix + std::to_string(i);
-        LOG_INFO("Received Message with [ content - "
-                 << receivedMsg.getDataAsString() << "] [ messageID = " << receivedMsg.getMessageId() << "]");
-        ASSERT_EQ(receivedMsg.getProperty("msgIndex"), std::to_string(i));
-        ASSERT_EQ(expectedMessageContent, receivedMsg.getDataAsString());
-        ASSERT_EQ(ResultOk, consumer.acknowledge(receivedMsg));
-    }
+    ASSERT_TRUE(auth != NULL);
+    ASSERT_EQ(auth->getAuthMethodName(), "token");
+
+    pulsar::AuthenticationDataPtr data;
+    ASSERT_EQ(auth->getAuthData(data), pulsar::ResultOk);
+    ASSERT_EQ(data->hasDataFromCommand(), true);
+    ASSERT_EQ(data->getCommandData(), getToken());
+    ASSERT_EQ(data->hasDataForTls(), false);
+    ASSERT_EQ(data->hasDataForHttp(), true);
+    ASSERT_EQ(auth.use_count(), 1);
+
+    config.setAuth(auth);
+    Client client(url, config);
+
+    const std::string protocol = (url == serviceUrlHttp) ? "http-" : "";
+    ASSERT_NO_FATAL_FAILURE(produceAndConsume(client, "persistent://private/auth/test-token-" + protocol +
+                                                          tokenSource + "-" + std::to_string(time(nullptr))));
 }
 
+INSTANTIATE_TEST_CASE_P(AuthPluginToken, AuthTokenProduceConsumeTest,
+                        ::testing::Combine(::testing::Values(serviceUrl, serviceUrlHttp),
+                                           ::testing::Values("token", "supplier", "file")));
+
 TEST(AuthPluginToken, testNoAuth) {
     ClientConfiguration config;
     Client client(serviceUrl, config);
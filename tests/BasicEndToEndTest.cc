@@ -24,6 +24,8 @@
 #include <chrono>
 #include <cstring>
 #include <functional>
+#include <future>
+#include <memory>
 #include <mutex>
 #include <set>
 #include <sstream>
@@ -34,6 +36,8 @@
 #include "CustomRoutingPolicy.h"
 #include "HttpHelper.h"
 #include "PulsarFriend.h"
+#include "SendUtils.h"
+#include "WaitUtils.h"
 #include "lib/AckGroupingTrackerDisabled.h"
 #include "lib/AckGroupingTrackerEnabled.h"
 #include "lib/ClientConnection.h"
@@ -69,6 +73,17 @@ std::string unique_str() {
     return std::to_string(uniqueCounter++) + "_" + std::to_string(nanos);
 }
 
+// Expects that no more messages are delivered to the consumer within `timeoutMs`
+static void expectTimeoutOnRecv(Consumer &consumer, int timeoutMs = 100) {
+    Message msg;
+    Result res = consumer.receive(msg, timeoutMs);
+    if (res != ResultTimeout) {
+        LOG_ERROR("Received a msg when not expecting to id(" << msg.getMessageId() << ") "
+                                                             << msg.getDataAsString());
+    }
+    ASSERT_EQ(ResultTimeout, res);
+}
+
 static void messageListenerFunction(Consumer consumer, const Message &msg) {
     globalCount++;
     consumer.acknowledge(msg);
@@ -886,9 +901,12 @@ TEST(BasicEndToEndTest, testMessageListener) {
     // Initializing global Count
     globalCount = 0;
 
+    Latch latch(10);
     ConsumerConfiguration consumerConfig;
-    consumerConfig.setMessageListener(
-        std::bind(messageListenerFunction, std::placeholders::_1, std::placeholders::_2));
+    consumerConfig.setMessageListener([latch](Consumer consumer, const Message &msg) mutable {
+        messageListenerFunction(consumer, msg);
+        latch.countdown();
+    });
     Consumer consumer;
     result = client.subscribe(topicName, "subscription-A", consumerConfig, consumer);
 
@@ -902,8 +920,7 @@ TEST(BasicEndToEndTest, testMessageListener) {
         ASSERT_EQ(ResultOk, producer.send(msg));
     }
 
-    // Sleeping for 5 seconds
-    std::this_thread::sleep_for(std::chrono::microseconds(5 * 1000 * 1000));
+    ASSERT_TRUE(latch.wait(std::chrono::seconds(5)));
     ASSERT_EQ(globalCount, 10);
     consumer.close();
     producer.close();
@@ -1033,20 +1050,23 @@ TEST(BasicEndToEndTest, testStatsLatencies) {
 
     // Send Asynchronously
     std::string prefix = "msg-stats-";
-    int count = 0;
+    // The callbacks share the counter by value, so late callbacks stay valid if the wait below times out
+    auto count = std::make_shared<int>(0);
+    Latch latch(numOfMessages);
     for (int i = 0; i < numOfMessages; i++) {
         std::string messageContent = prefix + std::to_string(i);
         Message msg =
             MessageBuilder().setContent(messageContent).setProperty("msgIndex", std::to_string(i)).build();
-        producer.sendAsync(msg, std::bind(&sendCallBackWithDelay, std::placeholders::_1,
-                                          std::placeholders::_2, prefix, 15, 2 * 1e3, &count));
+        producer.sendAsync(msg, [prefix, count, latch](Result result, const MessageId &msgId) mutable {
+            sendCallBackWithDelay(result, msgId, prefix, 15, 2 * 1e3, count.get());
+            latch.countdown();
+        });
         LOG_DEBUG("sending message " << messageContent);
     }
 
-    // Wait for all messages to be acked by broker
-    while (PulsarFriend::sum(producerStatsImplPtr->getTotalSendMap()) < numOfMessages) {
-        std::this_thread::sleep_for(std::chrono::microseconds(1000));  // 1 ms
-    }
+    // Wait for all messages to be acked by broker, the stats are updated before the send callback is called
+    ASSERT_TRUE(latch.wait(std::chrono::seconds(30)));
+    ASSERT_EQ(PulsarFriend::sum(producerStatsImplPtr->getTotalSendMap()), numOfMessages);
 
     // Get latencies
     LatencyAccumulator totalLatencyAccumulator = producerStatsImplPtr->getTotalLatencyAccumulator();
@@ -1560,7 +1580,8 @@ TEST(BasicEndToEndTest, testSeek) {
     Producer producer;
 
     Promise<Result, Producer> producerPromise;
-    client.createProducerAsync(topicName, WaitForCallbackValue<Producer>(producerPromise));
+    client.createProducerAsync(topicName, batchingProducerConf(100),
+                               WaitForCallbackValue<Producer>(producerPromise));
     Future<Result, Producer> producerFuture = producerPromise.getFuture();
     Result result = producerFuture.get(producer);
     ASSERT_EQ(ResultOk, result);
@@ -1579,40 +1600,27 @@ TEST(BasicEndToEndTest, testSeek) {
     ASSERT_EQ(temp, topicName);
     ASSERT_EQ(consumer.getSubscriptionName(), subName);
 
-    // Send 1000 messages synchronously
-    std::string msgContent = "msg-content";
-    LOG_INFO("Publishing 100 messages synchronously");
-    int msgNum = 0;
-    for (; msgNum < 100; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer.send(msg));
-    }
+    LOG_INFO("Publishing 100 messages asynchronously");
+    const auto payloads = makePayloads("msg-content", 0, 100);
+    ASSERT_EQ(ResultOk, sendAllAsync(producer, payloads));
 
     LOG_INFO("Trying to receive 100 messages");
     Message msgReceived;
-    for (msgNum = 0; msgNum < 100; msgNum++) {
+    for (const auto &payload : payloads) {
         consumer.receive(msgReceived, 3000);
         LOG_DEBUG("Received message :" << msgReceived.getMessageId());
-        std::stringstream expected;
-        expected << msgContent << msgNum;
-        ASSERT_EQ(expected.str(), msgReceived.getDataAsString());
+        ASSERT_EQ(payload, msgReceived.getDataAsString());
         ASSERT_EQ(ResultOk, consumer.acknowledge(msgReceived));
     }
 
     // seek to earliest, expected receive first message.
     result = consumer.seek(MessageId::earliest());
-    // Sleeping for 500ms to wait for consumer re-connect
-    std::this_thread::sleep_for(std::chrono::microseconds(500 * 1000));
-
     ASSERT_EQ(ResultOk, result);
-    consumer.receive(msgReceived, 3000);
+    // The receive queue is cleared once the seek succeeds, so just wait for the consumer to re-connect and
+    // redeliver from the new position
+    ASSERT_EQ(ResultOk, consumer.receive(msgReceived, 5000));
     LOG_ERROR("Received message :" << msgReceived.getMessageId());
-    std::stringstream expected;
-    msgNum = 0;
-    expected << msgContent << msgNum;
-    ASSERT_EQ(expected.str(), msgReceived.getDataAsString());
+    ASSERT_EQ(payloads[0], msgReceived.getDataAsString());
     ASSERT_EQ(ResultOk, consumer.acknowledge(msgReceived));
     ASSERT_EQ(ResultOk, consumer.unsubscribe());
     ASSERT_EQ(ResultAlreadyClosed, consumer.close());
@@ -1680,11 +1688,11 @@ TEST(BasicEndToEndTest, testSeekOnPartitionedTopic) {
 
     // seek to the time before sending messages, expected receive first message.
     result = consumer.seek(timestampMillis);
-    // Sleeping for 500ms to wait for consumer re-connect
-    std::this_thread::sleep_for(std::chrono::microseconds(500 * 1000));
-
     ASSERT_EQ(ResultOk, result);
-    consumer.receive(msgReceived, 3000);
+    // The seek only clears the queues of the internal consumers, not the queue of the multi-topics consumer.
+    // The queue is empty here because all messages were received before the seek, so just wait for the
+    // consumers to re-connect and redeliver from the new position
+    ASSERT_EQ(ResultOk, consumer.receive(msgReceived, 5000));
     LOG_ERROR("Received message :" << msgReceived.getMessageId());
     std::stringstream expected;
     msgNum = 0;
@@ -1950,30 +1958,32 @@ TEST(BasicEndToEndTest, testMultiTopicsConsumerPubSub) {
     std::string url2 = adminUrl + "admin/v2/persistent/public/default/testMultiTopicsConsumer2/partitions";
     std::string url3 = adminUrl + "admin/v2/persistent/public/default/testMultiTopicsConsumer3/partitions";
 
-    int res = makePutRequest(url1, "2");
-    ASSERT_FALSE(res != 204 && res != 409);
-    res = makePutRequest(url2, "3");
-    ASSERT_FALSE(res != 204 && res != 409);
-    res = makePutRequest(url3, "4");
-    ASSERT_FALSE(res != 204 && res != 409);
+    std::vector<std::future<int>> futures;
+    futures.emplace_back(std::async(std::launch::async, makePutRequest, url1, "2"));
+    futures.emplace_back(std::async(std::launch::async, makePutRequest, url2, "3"));
+    futures.emplace_back(std::async(std::launch::async, makePutRequest, url3, "4"));
+    for (auto &future : futures) {
+        int res = future.get();
+        ASSERT_FALSE(res != 204 && res != 409);
+    }
 
+    const int messageNumber = 100;
     Producer producer1;
-    Result result = client.createProducer(topicName1, producer1);
+    Result result = client.createProducer(topicName1, batchingProducerConf(messageNumber), producer1);
     ASSERT_EQ(ResultOk, result);
     Producer producer2;
-    result = client.createProducer(topicName2, producer2);
+    result = client.createProducer(topicName2, batchingProducerConf(messageNumber), producer2);
     ASSERT_EQ(ResultOk, result);
     Producer producer3;
-    result = client.createProducer(topicName3, producer3);
+    result = client.createProducer(topicName3, batchingProducerConf(messageNumber), producer3);
     ASSERT_EQ(ResultOk, result);
 
     Producer producer4;
-    result = client.createProducer(topicName4, producer4);
+    result = client.createProducer(topicName4, batchingProducerConf(messageNumber), producer4);
     ASSERT_EQ(ResultOk, result);
 
     LOG_INFO("created 4 producers");
 
-    int messageNumber = 100;
     ConsumerConfiguration consConfig;
     consConfig.setConsumerType(ConsumerShared);
     consConfig.setReceiverQueueSize(10);  // size for each sub-consumer
@@ -1986,40 +1996,11 @@ TEST(BasicEndToEndTest, testMultiTopicsConsumerPubSub) {
     ASSERT_EQ(consumer.getSubscriptionName(), subName);
     LOG_INFO("created topics consumer on 4 topics");
 
-    std::string msgContent = "msg-content";
-    LOG_INFO("Publishing 100 messages by producer 1 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer1.send(msg));
-    }
-
-    msgContent = "msg-content2";
-    LOG_INFO("Publishing 100 messages by producer 2 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer2.send(msg));
-    }
-
-    msgContent = "msg-content3";
-    LOG_INFO("Publishing 100 messages by producer 3 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer3.send(msg));
-    }
-
-    msgContent = "msg-content4";
-    LOG_INFO("Publishing 100 messages by producer 4 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer4.send(msg));
+    std::vector<Producer> producers{producer1, producer2, producer3, producer4};
+    for (size_t i = 0; i < producers.size(); i++) {
+        LOG_INFO("Publishing 100 messages by producer " << (i + 1) << " asynchronously");
+        ASSERT_EQ(ResultOk, sendAllAsync(producers[i], makePayloads("msg-content" + std::to_string(i + 1), 0,
+                                                                    messageNumber)));
     }
 
     LOG_INFO("Consuming and acking 400 messages by multiTopicsConsumer");
@@ -2036,6 +2017,12 @@ TEST(BasicEndToEndTest, testMultiTopicsConsumerPubSub) {
     client.shutdown();
 }
 
+// Delete the topic left by a previous run and create it again with the given number of partitions
+static int recreatePartitionedTopic(const std::string &url, const std::string &numPartitions) {
+    makeDeleteRequest(url);
+    return makePutRequest(url, numPartitions);
+}
+
 TEST(BasicEndToEndTest, testPatternTopicsConsumerInvalid) {
     Client client(lookupUrl);
 
@@ -2077,18 +2064,15 @@ TEST(BasicEndToEndTest, testPatternMultiTopicsConsumerPubSub) {
     std::string url4 =
         adminUrl + "admin/v2/persistent/public/default/patternMultiTopicsNotMatchPubSub4/partitions";
 
-    makeDeleteRequest(url1);
-    int res = makePutRequest(url1, "2");
-    ASSERT_FALSE(res != 204 && res != 409);
-    makeDeleteRequest(url2);
-    res = makePutRequest(url2, "3");
-    ASSERT_FALSE(res != 204 && res != 409);
-    makeDeleteRequest(url3);
-    res = makePutRequest(url3, "4");
-    ASSERT_FALSE(res != 204 && res != 409);
-    makeDeleteRequest(url4);
-    res = makePutRequest(url4, "4");
-    ASSERT_FALSE(res != 204 && res != 409);
+    std::vector<std::future<int>> futures;
+    futures.emplace_back(std::async(std::launch::async, recreatePartitionedTopic, url1, "2"));
+    futures.emplace_back(std::async(std::launch::async, recreatePartitionedTopic, url2, "3"));
+    futures.emplace_back(std::async(std::launch::async, recreatePartitionedTopic, url3, "4"));
+    futures.emplace_back(std::async(std::launch::async, recreatePartitionedTopic, url4, "4"));
+    for (auto &future : futures) {
+        int res = future.get();
+        ASSERT_FALSE(res != 204 && res != 409);
+    }
 
     Producer producer1;
     Result result = client.createProducer(topicName1, producer1);
@@ -2119,40 +2103,16 @@ TEST(BasicEndToEndTest, testPatternMultiTopicsConsumerPubSub) {
     ASSERT_EQ(consumer.getSubscriptionName(), subName);
     LOG_INFO("created topics consumer on a pattern that match 3 topics");
 
-    std::string msgContent = "msg-content";
-    LOG_INFO("Publishing 100 messages by producer 1 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer1.send(msg));
-    }
-
-    msgContent = "msg-content2";
-    LOG_INFO("Publishing 100 messages by producer 2 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer2.send(msg));
-    }
-
-    msgContent = "msg-content3";
-    LOG_INFO("Publishing 100 messages by producer 3 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer3.send(msg));
+    LOG_INFO("Publishing 100 messages by each of the 4 producers concurrently");
+    std::vector<Producer> producers{producer1, producer2, producer3, producer4};
+    std::vector<std::future<Result>> sendFutures;
+    for (size_t i = 0; i < producers.size(); i++) {
+        sendFutures.emplace_back(
+            std::async(std::launch::async, sendAll, std::ref(producers[i]),
+                       makePayloads("msg-content" + std::to_string(i + 1), 0, messageNumber)));
     }
-
-    msgContent = "msg-content4";
-    LOG_INFO("Publishing 100 messages by producer 4 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer4.send(msg));
+    for (auto &sendFuture : sendFutures) {
+        ASSERT_EQ(ResultOk, sendFuture.get());
     }
 
     LOG_INFO("Consuming and acking 300 messages by multiTopicsConsumer");
@@ -2164,8 +2124,7 @@ TEST(BasicEndToEndTest, testPatternMultiTopicsConsumerPubSub) {
     LOG_INFO("Consumed and acked 300 messages by multiTopicsConsumer");
 
     // verify no more to receive, because producer4 not match pattern
-    Message m;
-    ASSERT_EQ(ResultTimeout, consumer.receive(m, 1000));
+    expectTimeoutOnRecv(consumer, 1000);
 
     ASSERT_EQ(ResultOk, consumer.unsubscribe());
 
@@ -2190,15 +2149,14 @@ TEST(BasicEndToEndTest, testpatternMultiTopicsHttpConsumerPubSub) {
     std::string url3 =
         adminUrl + "admin/v2/persistent/public/default/patternMultiTopicsHttpConsumerPubSub3/partitions";
 
-    makeDeleteRequest(url1);
-    int res = makePutRequest(url1, "2");
-    ASSERT_FALSE(res != 204 && res != 409);
-    makeDeleteRequest(url2);
-    res = makePutRequest(url2, "3");
-    ASSERT_FALSE(res != 204 && res != 409);
-    makeDeleteRequest(url3);
-    res = makePutRequest(url3, "4");
-    ASSERT_FALSE(res != 204 && res != 409);
+    std::vector<std::future<int>> futures;
+    futures.emplace_back(std::async(std::launch::async, recreatePartitionedTopic, url1, "2"));
+    futures.emplace_back(std::async(std::launch::async, recreatePartitionedTopic, url2, "3"));
+    futures.emplace_back(std::async(std::launch::async, recreatePartitionedTopic, url3, "4"));
+    for (auto &future : futures) {
+        int res = future.get();
+        ASSERT_FALSE(res != 204 && res != 409);
+    }
 
     Producer producer1;
     Result result = client.createProducer(topicName1, producer1);
@@ -2226,31 +2184,16 @@ TEST(BasicEndToEndTest, testpatternMultiTopicsHttpConsumerPubSub) {
     ASSERT_EQ(consumer.getSubscriptionName(), subName);
     LOG_INFO("created topics consumer on a pattern that match 3 topics");
 
-    std::string msgContent = "msg-content";
-    LOG_INFO("Publishing 100 messages by producer 1 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer1.send(msg));
-    }
-
-    msgContent = "msg-content2";
-    LOG_INFO("Publishing 100 messages by producer 2 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer2.send(msg));
+    LOG_INFO("Publishing 100 messages by each of the 3 producers concurrently");
+    std::vector<Producer> producers{producer1, producer2, producer3};
+    std::vector<std::future<Result>> sendFutures;
+    for (size_t i = 0; i < producers.size(); i++) {
+        sendFutures.emplace_back(
+            std::async(std::launch::async, sendAll, std::ref(producers[i]),
+                       makePayloads("msg-content" + std::to_string(i + 1), 0, messageNumber)));
     }
-
-    msgContent = "msg-content3";
-    LOG_INFO("Publishing 100 messages by producer 3 synchronously");
-    for (int msgNum = 0; msgNum < messageNumber; msgNum++) {
-        std::stringstream stream;
-        stream << msgContent << msgNum;
-        Message msg = MessageBuilder().setContent(stream.str()).build();
-        ASSERT_EQ(ResultOk, producer3.send(msg));
+    for (auto &sendFuture : sendFutures) {
+        ASSERT_EQ(ResultOk, sendFuture.get());
     }
 
     LOG_INFO("Consuming and acking 300 messages by multiTopicsConsumer");
@@ -2262,8 +2205,7 @@ TEST(BasicEndToEndTest, testpatternMultiTopicsHttpConsumerPubSub) {
     LOG_INFO("Consumed and acked 300 messages by multiTopicsConsumer");
 
     // verify no more to receive
-    Message m;
-    ASSERT_EQ(ResultTimeout, consumer.receive(m, 1000));
+    expectTimeoutOnRecv(consumer, 1000);
 
     ASSERT_EQ(ResultOk, consumer.unsubscribe());
 
@@ -2351,12 +2293,19 @@ TEST(BasicEndToEndTest, testPatternMultiTopicsConsumerAutoDiscovery) {
         LOG_INFO("Consumed and acked 300 messages by pattern topics consumer");
 
         // verify no more to receive, because producers[3] not match pattern
-        Message m;
-        ASSERT_EQ(ResultTimeout, consumer.receive(m, 1000));
+        expectTimeoutOnRecv(consumer, 1000);
     });
 
-    // 3. wait enough time to trigger auto discovery
-    std::this_thread::sleep_for(std::chrono::seconds(2));
+    // 3. wait until auto discovery subscribes to all partitions of the 3 matched topics. A rerun of a failed
+    // test might also find the topic created in step 5 by the previous run, since the broker deletes
+    // inactive topics only after a while, so more consumers are accepted.
+    auto multiTopicsConsumer = PulsarFriend::getMultiTopicsConsumerImplPtr(consumer);
+    waitUntil(
+        std::chrono::seconds(10),
+        [&multiTopicsConsumer] { return multiTopicsConsumer->getNumberOfConnectedConsumer() >= 2 + 3 + 4; },
+        100);
+    // Not an ASSERT since consumeThread must be joined before returning
+    EXPECT_GE(multiTopicsConsumer->getNumberOfConnectedConsumer(), 2 + 3 + 4);
 
     // 4. produce data.
     for (size_t i = 0; i < producers.size(); i++) {
@@ -2382,14 +2331,19 @@ TEST(BasicEndToEndTest, testPatternMultiTopicsConsumerAutoDiscovery) {
         LOG_INFO("Consumed and acked 100 messages by pattern topics consumer");
 
         // verify no more to receive
-        Message m;
-        ASSERT_EQ(ResultTimeout, consumer.receive(m, 1000));
+        expectTimeoutOnRecv(consumer, 1000);
     });
     // 6. Create a producer to a new topic
     createProducer(producers[0], "patternTopicsAutoConsumerPubSub5", 4);
 
-    // 7. wait enough time to trigger auto discovery
-    std::this_thread::sleep_for(std::chrono::seconds(2));
+    // 7. wait until auto discovery subscribes to all partitions of the new topic as well
+    waitUntil(
+        std::chrono::seconds(10),
+        [&multiTopicsConsumer] {
+            return multiTopicsConsumer->getNumberOfConnectedConsumer() >= 2 + 3 + 4 + 4;
+        },
+        100);
+    EXPECT_GE(multiTopicsConsumer->getNumberOfConnectedConsumer(), 2 + 3 + 4 + 4);
 
     // 8. produce data
     for (int i = 0; i < messageNumber; i++) {
@@ -2615,10 +2569,13 @@ TEST(BasicEndToEndTest, testSyncFlushBatchMessagesPartitionedTopicLazyProducers)
 
 TEST(BasicEndToEndTest, testGetTopicPartitions) {
     Client client(lookupUrl);
-    std::string topicName = "persistent://public/default/testGetPartitions";
+    const std::string localName = "testGetPartitions";
+    const std::string topicName = "persistent://public/default/" + localName;
+    const std::vector<std::string> expectedPartitions{topicName + "-partition-0", topicName + "-partition-1",
+                                                      topicName + "-partition-2"};
 
-    // call admin api to make it partitioned
-    std::string url = adminUrl + "admin/v2/persistent/public/default/testGetPartitions/partitions";
+    // call admin api to make it partitioned, 409 means the topic was already created by a previous run
+    const std::string url = adminUrl + "admin/v2/persistent/public/default/" + localName + "/partitions";
     int res = makePutRequest(url, "3");
 
     LOG_INFO("res = " << res);
@@ -2626,10 +2583,9 @@ TEST(BasicEndToEndTest, testGetTopicPartitions) {
     std::vector<std::string> partitionsList;
     Result result = client.getPartitionsForTopic(topicName, partitionsList);
     ASSERT_EQ(ResultOk, result);
-    ASSERT_EQ(3, partitionsList.size());
-    ASSERT_EQ(topicName + "-partition-0", partitionsList[0]);
-    ASSERT_EQ(topicName + "-partition-1", partitionsList[1]);
-    ASSERT_EQ(topicName + "-partition-2", partitionsList[2]);
+    // The order of the partitions is not part of the API, the expected partitions are already sorted
+    std::sort(partitionsList.begin(), partitionsList.end());
+    ASSERT_EQ(expectedPartitions, partitionsList);
 
     std::vector<std::string> partitionsList2;
     result = client.getPartitionsForTopic("persistent://public/default/testGetPartitions-non-partitioned",
@@ -3097,16 +3053,6 @@ TEST(BasicEndToEndTest, testPartitionedReceiveAsyncFailedConsumer) {
     client.shutdown();
 }
 
-static void expectTimeoutOnRecv(Consumer &consumer) {
-    Message msg;
-    Result res = consumer.receive(msg, 100);
-    if (res != ResultTimeout) {
-        LOG_ERROR("Received a msg when not expecting to id(" << msg.getMessageId() << ") "
-                                                             << msg.getDataAsString());
-    }
-    ASSERT_EQ(ResultTimeout, res);
-}
-
 void testNegativeAcks(const std::string &topic, bool batchingEnabled) {
     Client client(lookupUrl);
     Consumer consumer;
@@ -3326,12 +3272,8 @@ TEST(BasicEndToEndTest, testPartitionedTopicWithOnePartition) {
     }
 
     // No more messages expected
-    Message msg;
-    Result res = consumer1.receive(msg, 100);
-    ASSERT_EQ(ResultTimeout, res);
-
-    res = consumer2.receive(msg, 100);
-    ASSERT_EQ(ResultTimeout, res);
+    expectTimeoutOnRecv(consumer1);
+    expectTimeoutOnRecv(consumer2);
     client.shutdown();
 }
 
@@ -3594,13 +3536,12 @@ TEST(BasicEndToEndTest, testAckGroupingTrackerSingleAckBehavior) {
         ASSERT_TRUE(tracker.callDoImmediateAck(connWeakPtr, consumerImpl.getConsumerId(), recvMsgId[msgIdx],
                                                CommandAck_AckType_Individual));
     }
-    Message msg;
-    ASSERT_EQ(ResultTimeout, consumer.receive(msg, 1000));
+    expectTimeoutOnRecv(consumer, 1000);
     consumer.close();
 
     std::this_thread::sleep_for(std::chrono::seconds(1));
     ASSERT_EQ(ResultOk, client.subscribe(topicName, subName, consumer));
-    ASSERT_EQ(ResultTimeout, consumer.receive(msg, 1000));
+    expectTimeoutOnRecv(consumer, 1000);
     consumer.close();
 }
 
@@ -3646,9 +3587,7 @@ TEST(BasicEndToEndTest, testAckGroupingTrackerMultiAckBehavior) {
 
     std::this_thread::sleep_for(std::chrono::seconds(1));
     ASSERT_EQ(ResultOk, client.subscribe(topicName, subName, consumer));
-    Message msg;
-    auto ret = consumer.receive(msg, 1000);
-    ASSERT_EQ(ResultTimeout, ret) << "Received redundant message: " << msg.getDataAsString();
+    expectTimeoutOnRecv(consumer, 1000);
     consumer.close();
 }
 
@@ -3692,9 +3631,7 @@ TEST(BasicEndToEndTest, testAckGroupingTrackerDisabledIndividualAck) {
 
     std::this_thread::sleep_for(std::chrono::seconds(1));
     ASSERT_EQ(ResultOk, client.subscribe(topicName, subName, consumer));
-    Message msg;
-    auto ret = consumer.receive(msg, 1000);
-    ASSERT_EQ(ResultTimeout, ret) << "Received redundant message: " << msg.getDataAsString();
+    expectTimeoutOnRecv(consumer, 1000);
     consumer.close();
 }
 
@@ -3737,9 +3674,7 @@ TEST(BasicEndToEndTest, testAckGroupingTrackerDisabledCumulativeAck) {
 
     std::this_thread::sleep_for(std::chrono::seconds(1));
     ASSERT_EQ(ResultOk, client.subscribe(topicName, subName, consumer));
-    Message msg;
-    auto ret = consumer.receive(msg, 1000);
-    ASSERT_EQ(ResultTimeout, ret) << "Received redundant message: " << msg.getDataAsString();
+    expectTimeoutOnRecv(consumer, 1000);
     consumer.close();
 }
 
@@ -3811,9 +3746,7 @@ TEST(BasicEndToEndTest, testAckGroupingTrackerEnabledIndividualAck) {
     consumer.close();
 
     ASSERT_EQ(ResultOk, client.subscribe(topicName, subName, consumer));
-    Message msg;
-    auto ret = consumer.receive(msg, 1000);
-    ASSERT_EQ(ResultTimeout, ret) << "Received redundant message: " << msg.getDataAsString();
+    expectTimeoutOnRecv(consumer, 1000);
 }
 
 TEST(BasicEndToEndTest, testAckGroupingTrackerEnabledCumulativeAck) {
@@ -3884,9 +3817,7 @@ TEST(BasicEndToEndTest, testAckGroupingTrackerEnabledCumulativeAck) {
         ASSERT_EQ(ResultOk, consumer.receive(msg, 1000));
         ASSERT_EQ(restMsgId.count(msg.getMessageId()), 1);
     }
-    Message msg;
-    auto ret = consumer.receive(msg, 1000);
-    ASSERT_EQ(ResultTimeout, ret) << "Received redundant message: " << msg.getDataAsString();
+    expectTimeoutOnRecv(consumer, 1000);
     auto tracker1 = std::make_shared<AckGroupingTrackerEnabledMock>(
         clientImplPtr, consumerImpl1, consumerImpl1->getConsumerId(), ackGroupingTimeMs, ackGroupingMaxSize);
     tracker1->start();
@@ -3895,8 +3826,7 @@ TEST(BasicEndToEndTest, testAckGroupingTrackerEnabledCumulativeAck) {
     consumer.close();
 
     ASSERT_EQ(ResultOk, client.subscribe(topicName, subName, consumer));
-    ret = consumer.receive(msg, 1000);
-    ASSERT_EQ(ResultTimeout, ret) << "Received redundant message ID: " << msg.getMessageId();
+    expectTimeoutOnRecv(consumer, 1000);
 }
 
 class UnAckedMessageTrackerEnabledMock : public UnAckedMessageTrackerEnabled {
@@ -3957,9 +3887,7 @@ TEST(BasicEndToEndTest, testUnAckedMessageTrackerDisabled) {
 
     std::this_thread::sleep_for(std::chrono::seconds(1));
     ASSERT_EQ(ResultOk, client.subscribe(topicName, subName, consumer));
-    Message msg;
-    auto ret = consumer.receive(msg, 1000);
-    ASSERT_EQ(ResultTimeout, ret) << "Received redundant message: " << msg.getDataAsString();
+    expectTimeoutOnRecv(consumer, 1000);
     consumer.close();
     client.close();
 }
@@ -4033,9 +3961,7 @@ TEST(BasicEndToEndTest, testUnAckedMessageTrackerEnabledIndividualAck) {
 
     std::this_thread::sleep_for(std::chrono::seconds(2));
     ASSERT_EQ(ResultOk, client.subscribe(topicName, subName, consumer));
-    Message msg;
-    auto ret = consumer.receive(msg, 1000);
-    ASSERT_EQ(ResultTimeout, ret) << "Received redundant message ID: " << msg.getMessageId();
+    expectTimeoutOnRecv(consumer, 1000);
     consumer.close();
     client.close();
 }
@@ -4098,9 +4024,7 @@ TEST(BasicEndToEndTest, testUnAckedMessageTrackerEnabledCumulativeAck) {
         ASSERT_EQ(ResultOk, consumer.receive(msg, 1000));
         ASSERT_EQ(ResultOk, consumer.acknowledge(msg.getMessageId()));
     }
-    Message msg;
-    auto ret = consumer.receive(msg, 1000);
-    ASSERT_EQ(ResultTimeout, ret) << "Received redundant message ID: " << msg.getMessageId();
+    expectTimeoutOnRecv(consumer, 1000);
     consumer.close();
     client.close();
 }
@@ -23,6 +23,7 @@
 #include <thread>
 
 #include "HttpHelper.h"
+#include "SendUtils.h"
 
 using namespace pulsar;
 
@@ -62,10 +63,9 @@ TEST(ClientDeduplicationTest, testProducerSequenceAfterReconnect) {
 
     ASSERT_EQ(producer.getLastSequenceId(), -1L);
 
+    const auto payloads = makePayloads("my-message-", 0, 20);
     for (int i = 0; i < 10; i++) {
-        std::string content = "my-message-" + std::to_string(i);
-        Message msg = MessageBuilder().setContent(content).build();
-        ASSERT_EQ(producer.send(msg), ResultOk);
+        ASSERT_EQ(producer.send(MessageBuilder().setContent(payloads[i]).build()), ResultOk);
         ASSERT_EQ(producer.getLastSequenceId(), i);
     }
 
@@ -75,9 +75,7 @@ TEST(ClientDeduplicationTest, testProducerSequenceAfterReconnect) {
     ASSERT_EQ(producer.getLastSequenceId(), 9);
 
     for (int i = 10; i < 20; i++) {
-        std::string content = "my-message-" + std::to_string(i);
-        Message msg = MessageBuilder().setContent(content).build();
-        ASSERT_EQ(producer.send(msg), ResultOk);
+        ASSERT_EQ(producer.send(MessageBuilder().setContent(payloads[i]).build()), ResultOk);
         ASSERT_EQ(producer.getLastSequenceId(), i);
     }
 
@@ -543,6 +543,7 @@ TEST(ConsumerTest, testPartitionedConsumerUnexpectedAckTimeout) {
     constexpr int tickDurationInMs = 1000;
     pulsar::Latch latch(numOfMessages);
     std::vector<Message> messages;
+    messages.reserve(numOfMessages);
     std::mutex mtx;
 
     int res =
@@ -1034,21 +1035,19 @@ class ConsumerSeekTest : public ::testing::TestWithParam<bool> {
 };
 
 TEST_P(ConsumerSeekTest, testSeekForMessageId) {
-    Client client(lookupUrl);
-
     const std::string topic = "test-seek-for-message-id-" + std::string((GetParam() ? "batch-" : "")) +
                               std::to_string(time(nullptr));
 
     Producer producer;
-    ASSERT_EQ(ResultOk, client.createProducer(topic, producerConf_, producer));
+    ASSERT_EQ(ResultOk, client_.createProducer(topic, producerConf_, producer));
 
     Consumer consumerExclusive;
-    ASSERT_EQ(ResultOk, client.subscribe(topic, "sub-0", consumerExclusive));
+    ASSERT_EQ(ResultOk, client_.subscribe(topic, "sub-0", consumerExclusive));
 
     Consumer consumerInclusive;
     ASSERT_EQ(ResultOk,
-              client.subscribe(topic, "sub-1", ConsumerConfiguration().setStartMessageIdInclusive(true),
-                               consumerInclusive));
+              client_.subscribe(topic, "sub-1", ConsumerConfiguration().setStartMessageIdInclusive(true),
+                                consumerInclusive));
 
     const auto numMessages = 100;
     MessageId seekMessageId;
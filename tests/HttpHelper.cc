@@ -20,14 +20,80 @@
 
 #include <curl/curl.h>
 
+#include <iostream>
+#include <mutex>
+
 static size_t curlWriteCallback(void* contents, size_t size, size_t nmemb, void* responseDataPtr) {
-    ((std::string*)responseDataPtr)->append((char*)contents, size * nmemb);
+    // Callers that don't read the response body pass no buffer, the body is then discarded without copying
+    if (responseDataPtr) {
+        static_cast<std::string*>(responseDataPtr)->append(static_cast<char*>(contents), size * nmemb);
+    }
     return size * nmemb;
 }
 
+// libcurl keeps the connections of an easy handle alive after a transfer, so each thread reuses its handle to
+// avoid establishing a new connection to the admin service for every request
+class CurlHandle {
+   public:
+    CurlHandle() : curl_(curl_easy_init()) {}
+    ~CurlHandle() { curl_easy_cleanup(curl_); }
+
+    CurlHandle(const CurlHandle&) = delete;
+    CurlHandle& operator=(const CurlHandle&) = delete;
+
+    CURL* get() {
+        // Reset the options of the previous request, the connection cache is kept
+        curl_easy_reset(curl_);
+        return curl_;
+    }
+
+   private:
+    CURL* const curl_;
+};
+
+// The DNS cache is shared by the curl handles of all threads, so that a thread sending its first request
+// doesn't resolve the admin service host again. The connection cache is not shared, libcurl doesn't support
+// sharing it between handles that are used concurrently by different threads.
+class CurlShare {
+   public:
+    CurlShare() : share_(curl_share_init()) {
+        curl_share_setopt(share_, CURLSHOPT_LOCKFUNC, &CurlShare::lock);
+        curl_share_setopt(share_, CURLSHOPT_UNLOCKFUNC, &CurlShare::unlock);
+        curl_share_setopt(share_, CURLSHOPT_USERDATA, this);
+        curl_share_setopt(share_, CURLSHOPT_SHARE, CURL_LOCK_DATA_DNS);
+    }
+    ~CurlShare() { curl_share_cleanup(share_); }
+
+    CurlShare(const CurlShare&) = delete;
+    CurlShare& operator=(const CurlShare&) = delete;
+
+    CURLSH* get() const { return share_; }
+
+   private:
+    CURLSH* const share_;
+    std::mutex mutexes_[CURL_LOCK_DATA_LAST];
+
+    static void lock(CURL*, curl_lock_data data, curl_lock_access, void* self) {
+        static_cast<CurlShare*>(self)->mutexes_[data].lock();
+    }
+
+    static void unlock(CURL*, curl_lock_data data, void* self) {
+        static_cast<CurlShare*>(self)->mutexes_[data].unlock();
+    }
+};
+
 static int makeRequest(const std::string& method, const std::string& url, const std::string& body,
-                       const std::string& responseData) {
-    CURL* curl = curl_easy_init();
+                       std::string* responseData) {
+    // curl_global_init() is not thread safe before curl 7.84.0, while requests might be sent concurrently
+    static std::once_flag curlInitFlag;
+    std::call_once(curlInitFlag, [] { curl_global_init(CURL_GLOBAL_ALL); });
+
+    // The share must be destroyed after the curl handle of the main thread, which is destroyed first as a
+    // thread local object
+    static CurlShare curlShare;
+    thread_local CurlHandle curlHandle;
+    CURL* curl = curlHandle.get();
+    curl_easy_setopt(curl, CURLOPT_SHARE, curlShare.get());
 
     struct curl_slist* list = NULL;
 
@@ -42,31 +108,32 @@ static int makeRequest(const std::string& method, const std::string& url, const
 
     // Write callback
     curl_easy_setopt(curl, CURLOPT_WRITEFUNCTION, curlWriteCallback);
-    curl_easy_setopt(curl, CURLOPT_WRITEDATA, &responseData);
+    curl_easy_setopt(curl, CURLOPT_WRITEDATA, responseData);
 
-    int res = curl_easy_perform(curl);
+    CURLcode res = curl_easy_perform(curl);
     curl_slist_free_all(list); /* free the list again */
 
     if (res != CURLE_OK) {
+        // The request didn't reach the admin service, which must not be confused with an HTTP error status
+        std::cerr << method << " " << url << " failed: " << curl_easy_strerror(res) << std::endl;
         return -1;
     }
 
     long httpResult = 0;
     curl_easy_getinfo(curl, CURLINFO_RESPONSE_CODE, &httpResult);
-    curl_easy_cleanup(curl);
     return (int)httpResult;
 }
 
 int makePutRequest(const std::string& url, const std::string& body) {
-    return makeRequest("PUT", url, body, "");
+    return makeRequest("PUT", url, body, nullptr);
 }
 
 int makePostRequest(const std::string& url, const std::string& body) {
-    return makeRequest("POST", url, body, "");
+    return makeRequest("POST", url, body, nullptr);
 }
 
-int makeDeleteRequest(const std::string& url) { return makeRequest("DELETE", url, "", ""); }
+int makeDeleteRequest(const std::string& url) { return makeRequest("DELETE", url, "", nullptr); }
 
-int makeGetRequest(const std::string& url, const std::string& responseData) {
-    return makeRequest("GET", url, "", responseData);
+int makeGetRequest(const std::string& url, std::string& responseData) {
+    return makeRequest("GET", url, "", &responseData);
 }
@@ -19,6 +19,8 @@
 #include <gtest/gtest.h>
 #include <pulsar/ProducerConfiguration.h>
 
+#include <stdexcept>
+
 #include "NoOpsCryptoKeyReader.h"
 
 using namespace pulsar;
@@ -135,3 +137,9 @@ TEST(ProducerConfigurationTest, testCustomConfig) {
     conf.setChunkingEnabled(true);
     ASSERT_EQ(conf.isChunkingEnabled(), true);
 }
+
+TEST(ProducerConfigurationTest, testInvalidBatchingMaxMessages) {
+    ProducerConfiguration conf;
+    ASSERT_THROW(conf.setBatchingMaxMessages(1), std::invalid_argument);
+    ASSERT_EQ(conf.getBatchingMaxMessages(), 1000);
+}
@@ -114,6 +114,7 @@ TEST(ProtobufNativeSchemaTest, testSchemaIncompatibility) {
     // createProtobufNativeSchema() cannot accept a null descriptor
     try {
         createProducerResult(nullptr);
+        FAIL() << "createProtobufNativeSchema() should throw for a null descriptor";
     } catch (const std::invalid_argument& e) {
         ASSERT_STREQ(e.what(), "descriptor is null");
     }
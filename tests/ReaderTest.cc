@@ -21,10 +21,13 @@
 #include <pulsar/Reader.h>
 #include <time.h>
 
+#include <memory>
 #include <string>
+#include <vector>
 
 #include "HttpHelper.h"
 #include "PulsarFriend.h"
+#include "SendUtils.h"
 #include "WaitUtils.h"
 #include "lib/ClientConnection.h"
 #include "lib/Latch.h"
@@ -37,8 +40,41 @@ using namespace pulsar;
 static std::string serviceUrl = "pulsar://localhost:6650";
 static const std::string adminUrl = "http://localhost:8080/";
 
+// Reads up to `count` messages and returns their payloads, stopping early if a read fails so that the
+// caller's comparison against the expected payloads reports the mismatch
+static std::vector<std::string> readPayloads(Reader& reader, int count, MessageId* lastMessageId = nullptr) {
+    std::vector<std::string> payloads;
+    payloads.reserve(count);
+    for (int i = 0; i < count; i++) {
+        Message msg;
+        if (reader.readNext(msg, 10000) != ResultOk) {
+            break;
+        }
+        payloads.emplace_back(msg.getDataAsString());
+        if (lastMessageId) {
+            *lastMessageId = msg.getMessageId();
+        }
+    }
+    return payloads;
+}
+
 class ReaderTest : public ::testing::TestWithParam<bool> {
    public:
+    // All tests of this suite share one client, so that the connection to the broker and the lookup results
+    // are reused across tests instead of being set up again by each test
+    static void SetUpTestCase() {
+        client_.reset(new Client(serviceUrl));
+        // Warm up the client with a lookup, which connects to the broker, so that the first test does not
+        // pay for setting up the connection. The result is ignored, each test still checks its own calls.
+        std::vector<std::string> partitions;
+        client_->getPartitionsForTopic("reader-test-warm-up", partitions);
+    }
+
+    static void TearDownTestCase() {
+        client_->close();
+        client_.reset();
+    }
+
     void initTopic(std::string topicName) {
         if (isMultiTopic_) {
             // call admin api to make it partitioned
@@ -50,22 +86,23 @@ class ReaderTest : public ::testing::TestWithParam<bool> {
     }
 
    protected:
+    static std::unique_ptr<Client> client_;
     bool isMultiTopic_ = GetParam();
 };
 
-TEST_P(ReaderTest, testSimpleReader) {
-    Client client(serviceUrl);
+std::unique_ptr<Client> ReaderTest::client_;
 
+TEST_P(ReaderTest, testSimpleReader) {
     std::string topicName =
         "test-simple-reader" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
 
     ReaderConfiguration readerConf;
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf, reader));
 
     Producer producer;
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producer));
 
     for (int i = 0; i < 10; i++) {
         std::string content = "my-message-" + std::to_string(i);
@@ -84,21 +121,18 @@ TEST_P(ReaderTest, testSimpleReader) {
 
     producer.close();
     reader.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testAsyncRead) {
-    Client client(serviceUrl);
-
     std::string topicName = "testAsyncRead" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
 
     ReaderConfiguration readerConf;
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf, reader));
 
     Producer producer;
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producer));
 
     for (int i = 0; i < 10; i++) {
         std::string content = "my-message-" + std::to_string(i);
@@ -129,18 +163,15 @@ TEST_P(ReaderTest, testAsyncRead) {
 
     producer.close();
     reader.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testReaderAfterMessagesWerePublished) {
-    Client client(serviceUrl);
-
     std::string topicName = "testReaderAfterMessagesWerePublished" + std::to_string(time(nullptr)) +
                             std::to_string(isMultiTopic_);
     initTopic(topicName);
 
     Producer producer;
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producer));
 
     for (int i = 0; i < 10; i++) {
         std::string content = "my-message-" + std::to_string(i);
@@ -150,7 +181,7 @@ TEST_P(ReaderTest, testReaderAfterMessagesWerePublished) {
 
     ReaderConfiguration readerConf;
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf, reader));
 
     for (int i = 0; i < 10; i++) {
         Message msg;
@@ -163,18 +194,15 @@ TEST_P(ReaderTest, testReaderAfterMessagesWerePublished) {
 
     producer.close();
     reader.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testMultipleReaders) {
-    Client client(serviceUrl);
-
     std::string topicName =
         "testMultipleReaders" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
 
     Producer producer;
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producer));
 
     for (int i = 0; i < 10; i++) {
         std::string content = "my-message-" + std::to_string(i);
@@ -184,10 +212,10 @@ TEST_P(ReaderTest, testMultipleReaders) {
 
     ReaderConfiguration readerConf;
     Reader reader1;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf, reader1));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf, reader1));
 
     Reader reader2;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf, reader2));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf, reader2));
 
     for (int i = 0; i < 10; i++) {
         Message msg;
@@ -210,97 +238,60 @@ TEST_P(ReaderTest, testMultipleReaders) {
     producer.close();
     reader1.close();
     reader2.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testReaderOnLastMessage) {
-    Client client(serviceUrl);
-
     std::string topicName =
         "testReaderOnLastMessage" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
 
     Producer producer;
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, batchingProducerConf(10), producer));
 
-    for (int i = 0; i < 10; i++) {
-        std::string content = "my-message-" + std::to_string(i);
-        Message msg = MessageBuilder().setContent(content).build();
-        ASSERT_EQ(ResultOk, producer.send(msg));
-    }
+    const auto oldPayloads = makePayloads("my-message-", 0, 10);
+    const auto newPayloads = makePayloads("my-message-", 10, 20);
+    ASSERT_EQ(ResultOk, sendAllAsync(producer, oldPayloads));
 
     ReaderConfiguration readerConf;
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::latest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::latest(), readerConf, reader));
 
-    for (int i = 10; i < 20; i++) {
-        std::string content = "my-message-" + std::to_string(i);
-        Message msg = MessageBuilder().setContent(content).build();
-        ASSERT_EQ(ResultOk, producer.send(msg));
-    }
+    ASSERT_EQ(ResultOk, sendAllAsync(producer, newPayloads));
 
-    for (int i = 10; i < 20; i++) {
-        Message msg;
-        ASSERT_EQ(ResultOk, reader.readNext(msg));
-
-        std::string content = msg.getDataAsString();
-        std::string expected = "my-message-" + std::to_string(i);
-        ASSERT_EQ(expected, content);
-    }
+    ASSERT_EQ(newPayloads, readPayloads(reader, newPayloads.size()));
 
     producer.close();
     reader.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testReaderOnSpecificMessage) {
-    Client client(serviceUrl);
-
     std::string topicName =
         "testReaderOnSpecificMessage" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
 
     Producer producer;
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producer));
 
-    for (int i = 0; i < 10; i++) {
-        std::string content = "my-message-" + std::to_string(i);
-        Message msg = MessageBuilder().setContent(content).build();
-        ASSERT_EQ(ResultOk, producer.send(msg));
+    const auto payloads = makePayloads("my-message-", 0, 10);
+    for (const auto& payload : payloads) {
+        ASSERT_EQ(ResultOk, producer.send(MessageBuilder().setContent(payload).build()));
     }
 
     ReaderConfiguration readerConf;
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf, reader));
 
     MessageId lastMessageId;
-
-    for (int i = 0; i < 5; i++) {
-        Message msg;
-        ASSERT_EQ(ResultOk, reader.readNext(msg));
-
-        std::string content = msg.getDataAsString();
-        std::string expected = "my-message-" + std::to_string(i);
-        ASSERT_EQ(expected, content);
-
-        lastMessageId = msg.getMessageId();
-    }
+    ASSERT_EQ(std::vector<std::string>(payloads.begin(), payloads.begin() + 5),
+              readPayloads(reader, 5, &lastMessageId));
 
     // Create another reader starting on msgid4
-    ASSERT_EQ(ResultOk, client.createReader(topicName, lastMessageId, readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, lastMessageId, readerConf, reader));
 
-    for (int i = 5; i < 10; i++) {
-        Message msg;
-        ASSERT_EQ(ResultOk, reader.readNext(msg));
-
-        std::string content = msg.getDataAsString();
-        std::string expected = "my-message-" + std::to_string(i);
-        ASSERT_EQ(expected, content);
-    }
+    ASSERT_EQ(std::vector<std::string>(payloads.begin() + 5, payloads.end()), readPayloads(reader, 5));
 
     producer.close();
     reader.close();
-    client.close();
 }
 
 /**
@@ -308,8 +299,6 @@ TEST_P(ReaderTest, testReaderOnSpecificMessage) {
  * batch
  */
 TEST_P(ReaderTest, testReaderOnSpecificMessageWithBatches) {
-    Client client(serviceUrl);
-
     std::string topicName = "testReaderOnSpecificMessageWithBatches" + std::to_string(time(nullptr)) +
                             std::to_string(isMultiTopic_);
     initTopic(topicName);
@@ -319,7 +308,7 @@ TEST_P(ReaderTest, testReaderOnSpecificMessageWithBatches) {
     ProducerConfiguration producerConf;
     producerConf.setBatchingEnabled(true);
     producerConf.setBatchingMaxPublishDelayMs(1000);
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producerConf, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producerConf, producer));
 
     for (int i = 0; i < 10; i++) {
         std::string content = "my-message-" + std::to_string(i);
@@ -334,7 +323,7 @@ TEST_P(ReaderTest, testReaderOnSpecificMessageWithBatches) {
 
     ReaderConfiguration readerConf;
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf, reader));
 
     std::string lastMessageId;
 
@@ -352,7 +341,7 @@ TEST_P(ReaderTest, testReaderOnSpecificMessageWithBatches) {
     // Create another reader starting on msgid4
     auto msgId4 = MessageId::deserialize(lastMessageId);
     Reader reader2;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, msgId4, readerConf, reader2));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, msgId4, readerConf, reader2));
 
     for (int i = 5; i < 11; i++) {
         Message msg;
@@ -366,12 +355,9 @@ TEST_P(ReaderTest, testReaderOnSpecificMessageWithBatches) {
     producer.close();
     reader.close();
     reader2.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testReaderReachEndOfTopic) {
-    Client client(serviceUrl);
-
     std::string topicName =
         "testReaderReachEndOfTopic" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
@@ -382,12 +368,12 @@ TEST_P(ReaderTest, testReaderReachEndOfTopic) {
     ProducerConfiguration producerConf;
     producerConf.setBatchingEnabled(true);
     producerConf.setBatchingMaxPublishDelayMs(1000);
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producerConf, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producerConf, producer));
 
     // 2. create reader, and expect hasMessageAvailable return false since no message produced.
     ReaderConfiguration readerConf;
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::latest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::latest(), readerConf, reader));
 
     bool hasMessageAvailable;
     ASSERT_EQ(ResultOk, reader.hasMessageAvailable(hasMessageAvailable));
@@ -443,12 +429,9 @@ TEST_P(ReaderTest, testReaderReachEndOfTopic) {
 
     producer.close();
     reader.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testReaderReachEndOfTopicMessageWithoutBatches) {
-    Client client(serviceUrl);
-
     std::string topicName = "testReaderReachEndOfTopicMessageWithoutBatches" + std::to_string(time(nullptr)) +
                             std::to_string(isMultiTopic_);
     initTopic(topicName);
@@ -457,12 +440,12 @@ TEST_P(ReaderTest, testReaderReachEndOfTopicMessageWithoutBatches) {
     Producer producer;
     ProducerConfiguration producerConf;
     producerConf.setBatchingEnabled(false);
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producerConf, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producerConf, producer));
 
     // 2. create reader, and expect hasMessageAvailable return false since no message produced.
     ReaderConfiguration readerConf;
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::latest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::latest(), readerConf, reader));
 
     bool hasMessageAvailable;
     ASSERT_EQ(ResultOk, reader.hasMessageAvailable(hasMessageAvailable));
@@ -500,7 +483,6 @@ TEST_P(ReaderTest, testReaderReachEndOfTopicMessageWithoutBatches) {
 
     producer.close();
     reader.close();
-    client.close();
 }
 
 TEST(ReaderTest, testPartitionIndex) {
@@ -545,8 +527,6 @@ TEST(ReaderTest, testPartitionIndex) {
 }
 
 TEST_P(ReaderTest, testSubscriptionNameSetting) {
-    Client client(serviceUrl);
-
     std::string topicName =
         "testSubscriptionNameSetting" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
@@ -555,17 +535,14 @@ TEST_P(ReaderTest, testSubscriptionNameSetting) {
     ReaderConfiguration readerConf;
     readerConf.setInternalSubscriptionName(subName);
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf, reader));
 
     ASSERT_EQ(subName, PulsarFriend::getConsumer(reader)->getSubscriptionName());
 
     reader.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testSetSubscriptionNameAndPrefix) {
-    Client client(serviceUrl);
-
     std::string topicName =
         "testSetSubscriptionNameAndPrefix" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
@@ -575,17 +552,14 @@ TEST_P(ReaderTest, testSetSubscriptionNameAndPrefix) {
     readerConf.setInternalSubscriptionName(subName);
     readerConf.setSubscriptionRolePrefix("my-prefix");
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf, reader));
 
     ASSERT_EQ(subName, PulsarFriend::getConsumer(reader)->getSubscriptionName());
 
     reader.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testMultiSameSubscriptionNameReaderShouldFail) {
-    Client client(serviceUrl);
-
     std::string topicName = "testMultiSameSubscriptionNameReaderShouldFail" + std::to_string(time(nullptr)) +
                             std::to_string(isMultiTopic_);
     initTopic(topicName);
@@ -594,29 +568,26 @@ TEST_P(ReaderTest, testMultiSameSubscriptionNameReaderShouldFail) {
     ReaderConfiguration readerConf1;
     readerConf1.setInternalSubscriptionName(subscriptionName);
     Reader reader1;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), readerConf1, reader1));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), readerConf1, reader1));
 
     ReaderConfiguration readerConf2;
     readerConf2.setInternalSubscriptionName(subscriptionName);
     Reader reader2;
     ASSERT_EQ(ResultConsumerBusy,
-              client.createReader(topicName, MessageId::earliest(), readerConf2, reader2));
+              client_->createReader(topicName, MessageId::earliest(), readerConf2, reader2));
 
     reader1.close();
     reader2.close();
-    client.close();
 }
 
 TEST_P(ReaderTest, testIsConnected) {
-    Client client(serviceUrl);
-
     std::string topicName = "testIsConnected" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
 
     Reader reader;
     ASSERT_FALSE(reader.isConnected());
 
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::earliest(), {}, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::earliest(), {}, reader));
     ASSERT_TRUE(reader.isConnected());
 
     ASSERT_EQ(ResultOk, reader.close());
@@ -624,8 +595,6 @@ TEST_P(ReaderTest, testIsConnected) {
 }
 
 TEST_P(ReaderTest, testHasMessageAvailableWhenCreated) {
-    Client client(serviceUrl);
-
     std::string topicName =
         "testHasMessageAvailableWhenCreated" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
@@ -633,7 +602,7 @@ TEST_P(ReaderTest, testHasMessageAvailableWhenCreated) {
     ProducerConfiguration producerConf;
     producerConf.setBatchingMaxMessages(3);
     Producer producer;
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producerConf, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producerConf, producer));
 
     std::vector<MessageId> messageIds;
     constexpr int numMessages = 7;
@@ -657,28 +626,29 @@ TEST_P(ReaderTest, testHasMessageAvailableWhenCreated) {
     bool hasMessageAvailable;
 
     for (size_t i = 0; i < messageIds.size() - 1; i++) {
-        ASSERT_EQ(ResultOk, client.createReader(topicName, messageIds[i], {}, reader));
+        ASSERT_EQ(ResultOk, client_->createReader(topicName, messageIds[i], {}, reader));
         ASSERT_EQ(ResultOk, reader.hasMessageAvailable(hasMessageAvailable));
         EXPECT_TRUE(hasMessageAvailable);
+        reader.close();
     }
 
     // The start message ID is exclusive by default, so when we start at the last message, there should be no
     // message available.
-    ASSERT_EQ(ResultOk, client.createReader(topicName, messageIds.back(), {}, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, messageIds.back(), {}, reader));
     ASSERT_EQ(ResultOk, reader.hasMessageAvailable(hasMessageAvailable));
     EXPECT_FALSE(hasMessageAvailable);
-    client.close();
+
+    producer.close();
+    reader.close();
 }
 
 TEST_P(ReaderTest, testReceiveAfterSeek) {
-    Client client(serviceUrl);
-
     std::string topicName =
         "testReceiveAfterSeek" + std::to_string(time(nullptr)) + std::to_string(isMultiTopic_);
     initTopic(topicName);
 
     Producer producer;
-    ASSERT_EQ(ResultOk, client.createProducer(topicName, producer));
+    ASSERT_EQ(ResultOk, client_->createProducer(topicName, producer));
 
     MessageId seekMessageId;
     for (int i = 0; i < 5; i++) {
@@ -690,14 +660,15 @@ TEST_P(ReaderTest, testReceiveAfterSeek) {
     }
 
     Reader reader;
-    ASSERT_EQ(ResultOk, client.createReader(topicName, MessageId::latest(), {}, reader));
+    ASSERT_EQ(ResultOk, client_->createReader(topicName, MessageId::latest(), {}, reader));
 
     reader.seek(seekMessageId);
 
     bool hasMessageAvailable;
     ASSERT_EQ(ResultOk, reader.hasMessageAvailable(hasMessageAvailable));
 
-    client.close();
+    producer.close();
+    reader.close();
 }
 
 INSTANTIATE_TEST_SUITE_P(Pulsar, ReaderTest, ::testing::Values(true, false));
\ No newline at end of file
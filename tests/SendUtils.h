@@ -0,0 +1,102 @@
+/**
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <pulsar/Producer.h>
+#include <pulsar/ProducerConfiguration.h>
+
+#include <atomic>
+#include <chrono>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "lib/Latch.h"
+
+namespace pulsar {
+
+/**
+ * Build the payloads prefix + i for i in [begin, end).
+ */
+inline std::vector<std::string> makePayloads(const std::string& prefix, int begin, int end) {
+    std::vector<std::string> payloads;
+    payloads.reserve(end - begin);
+    for (int i = begin; i < end; i++) {
+        payloads.emplace_back(prefix + std::to_string(i));
+    }
+    return payloads;
+}
+
+/**
+ * Create a producer configuration whose batches are sent as soon as maxMessages messages are accumulated, so
+ * that a burst of asynchronous sends is grouped into a few send commands without waiting for the publish
+ * delay.
+ */
+inline ProducerConfiguration batchingProducerConf(unsigned int maxMessages) {
+    return ProducerConfiguration()
+        .setBatchingEnabled(true)
+        .setBatchingMaxMessages(maxMessages)
+        .setBatchingMaxAllowedSizeInBytes(1024 * 1024)
+        .setBatchingMaxPublishDelayMs(10);
+}
+
+/**
+ * Send all the payloads synchronously one after another, stopping at the first failure. It can be run on a
+ * separate thread for each producer to publish to several topics concurrently.
+ *
+ * @return ResultOk if all messages were sent successfully, otherwise the first failed result
+ */
+inline Result sendAll(Producer& producer, const std::vector<std::string>& payloads) {
+    for (const auto& payload : payloads) {
+        Result result = producer.send(MessageBuilder().setContent(payload).build());
+        if (result != ResultOk) {
+            return result;
+        }
+    }
+    return ResultOk;
+}
+
+/**
+ * Send all the payloads asynchronously and wait until all the send callbacks are completed. Unlike calling
+ * Producer::send in a loop, the round trips to the broker overlap with each other.
+ *
+ * @return ResultOk if all messages were sent successfully, the first failed result if any send failed, or
+ * ResultTimeout if the callbacks were not all completed within the timeout
+ */
+inline Result sendAllAsync(Producer& producer, const std::vector<std::string>& payloads,
+                           std::chrono::milliseconds timeout = std::chrono::seconds(30)) {
+    Latch latch(payloads.size());
+    auto firstFailure = std::make_shared<std::atomic<Result>>(ResultOk);
+    for (const auto& payload : payloads) {
+        producer.sendAsync(MessageBuilder().setContent(payload).build(),
+                           [latch, firstFailure](Result result, const MessageId&) mutable {
+                               if (result != ResultOk) {
+                                   Result expected = ResultOk;
+                                   firstFailure->compare_exchange_strong(expected, result);
+                               }
+                               latch.countdown();
+                           });
+    }
+    if (!latch.wait(timeout)) {
+        return ResultTimeout;
+    }
+    return firstFailure->load();
+}
+
+}  // namespace pulsar
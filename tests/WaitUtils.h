@@ -18,22 +18,32 @@
  */
 #pragma once
 
+#include <algorithm>
 #include <chrono>
 #include <functional>
 #include <thread>
 
 namespace pulsar {
 
+/**
+ * Wait until the condition becomes true or the timeout expires.
+ *
+ * The condition is checked with an exponential backoff, the interval starts from 10 ms and grows by 1.5 times
+ * after each check until it reaches maxIntervalMs. Therefore, a condition that becomes true soon is detected
+ * soon, while a condition that takes long is not checked too frequently.
+ */
 template <typename Rep, typename Period>
 inline void waitUntil(std::chrono::duration<Rep, Period> timeout, const std::function<bool()>& condition,
-                      long durationMs = 10) {
+                      long maxIntervalMs = 10) {
     auto timeoutMs = std::chrono::duration_cast<std::chrono::milliseconds>(timeout).count();
+    long intervalMs = std::min(10L, maxIntervalMs);
     while (timeoutMs > 0) {
         auto now = std::chrono::high_resolution_clock::now();
         if (condition()) {
             break;
         }
-        std::this_thread::sleep_for(std::chrono::milliseconds(durationMs));
+        std::this_thread::sleep_for(std::chrono::milliseconds(intervalMs));
+        intervalMs = std::min(intervalMs * 3 / 2, maxIntervalMs);
         auto elapsed = std::chrono::duration_cast<std::chrono::milliseconds>(
                            std::chrono::high_resolution_clock::now() - now)
                            .count();
@@ -248,8 +248,10 @@ TEST(ZeroQueueSizeTest, testPauseResumeNoReconnection) {
         }
     };
 
+    constexpr int numMessages = 300;
     std::mutex mtxForMessages;
     std::vector<std::string> receivedMessages;
+    receivedMessages.reserve(numMessages);
 
     ConsumerConfiguration consumerConf;
     consumerConf.setReceiverQueueSize(0);
@@ -269,7 +271,6 @@ TEST(ZeroQueueSizeTest, testPauseResumeNoReconnection) {
     ASSERT_EQ(ResultOk,
               client.createProducer(topic, ProducerConfiguration().setBatchingEnabled(false), producer));
 
-    constexpr int numMessages = 300;
     for (int i = 0; i < numMessages; i++) {
         const auto message = MessageBuilder().setContent(std::to_string(i)).build();
         consumer.resumeMessageListener();